@@ -1,60 +1,85 @@
 #!/usr/bin/env python3
 """
 Run all tests against the deployed Cloud Run API.
+
+Each test runs in its own interpreter process so CPU work in one test
+(JSON parsing, audio decoding) cannot serialize the others behind the GIL,
+and the suite scales with cores as more tests are added.
 """
 import asyncio
+import os
 import sys
 from pathlib import Path
 
+try:
+    import uvloop
+except ImportError:  # uvloop is unavailable on Windows
+    uvloop = None
+
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from backend.tests.integration.test_lesson_context import test_lesson_context_workflow, test_pdf_lesson_plan
-from backend.tests.integration.test_feedback import test_feedback_streaming, test_multi_turn_feedback
+# Test entry points launched as independent subprocesses ("module:function")
+TEST_ENTRY_POINTS = [
+    ("Lesson Context Workflow", "backend.tests.integration.test_lesson_context:test_lesson_context_workflow"),
+    ("PDF Lesson Plan", "backend.tests.integration.test_lesson_context:test_pdf_lesson_plan"),
+    ("Feedback Streaming", "backend.tests.integration.test_feedback:test_feedback_streaming"),
+    ("Multi-Turn Feedback", "backend.tests.integration.test_feedback:test_multi_turn_feedback"),
+]
+
+
+async def _run_test_subprocess(
+    name: str, entry_point: str, semaphore: asyncio.Semaphore
+) -> tuple[str, int, bytes]:
+    """Run one test entry point in a subprocess, bounded by the semaphore.
+
+    Returns:
+        Tuple of (test name, exit code, captured stderr)
+    """
+    module, function = entry_point.split(":")
+    bootstrap = (
+        f"import sys; sys.path.insert(0, {str(Path(__file__).parent)!r}); "
+        f"import asyncio, {module}; asyncio.run({module}.{function}())"
+    )
+
+    async with semaphore:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", bootstrap,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        return name, process.returncode, stderr
 
 
 async def run_all_tests():
-    """Run all integration tests against Cloud Run."""
+    """Run all integration tests against Cloud Run, sharded across cores."""
     print("\n" + "="*80)
     print("🚀 RUNNING ALL TESTS AGAINST CLOUD RUN")
     print("   URL: https://rehearsed-multi-student-api-847407960490.us-central1.run.app")
     print("="*80)
-    
+
     tests_passed = 0
     tests_failed = 0
-    
-    # Test 1: Lesson Context Workflow
-    try:
-        await test_lesson_context_workflow()
-        tests_passed += 1
-    except Exception as e:
-        print(f"\n❌ Lesson Context Workflow FAILED: {e}")
-        tests_failed += 1
-    
-    # Test 2: PDF Lesson Plan
-    try:
-        await test_pdf_lesson_plan()
-        tests_passed += 1
-    except Exception as e:
-        print(f"\n❌ PDF Lesson Plan FAILED: {e}")
-        tests_failed += 1
-    
-    # Test 3: Feedback Streaming
-    try:
-        await test_feedback_streaming()
-        tests_passed += 1
-    except Exception as e:
-        print(f"\n❌ Feedback Streaming FAILED: {e}")
-        tests_failed += 1
-    
-    # Test 4: Multi-Turn Feedback
-    try:
-        await test_multi_turn_feedback()
-        tests_passed += 1
-    except Exception as e:
-        print(f"\n❌ Multi-Turn Feedback FAILED: {e}")
-        tests_failed += 1
-    
+
+    # Leave a couple of cores free for the main process and the OS
+    semaphore = asyncio.Semaphore(max(1, (os.cpu_count() or 2) - 2))
+
+    results = await asyncio.gather(
+        *(
+            _run_test_subprocess(name, entry_point, semaphore)
+            for name, entry_point in TEST_ENTRY_POINTS
+        )
+    )
+
+    for name, exit_code, stderr in results:
+        if exit_code != 0:
+            print(f"\n❌ {name} FAILED (exit code {exit_code})")
+            if stderr:
+                print(stderr.decode(errors="replace"))
+            tests_failed += 1
+        else:
+            tests_passed += 1
+
     # Summary
     print("\n\n" + "="*80)
     print("📊 TEST SUMMARY")
@@ -62,7 +87,7 @@ async def run_all_tests():
     print(f"✅ Passed: {tests_passed}")
     print(f"❌ Failed: {tests_failed}")
     print(f"📈 Total:  {tests_passed + tests_failed}")
-    
+
     if tests_failed == 0:
         print("\n🎉 ALL TESTS PASSED!")
         print("="*80 + "\n")
@@ -74,5 +99,7 @@ async def run_all_tests():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     exit_code = asyncio.run(run_all_tests())
     sys.exit(exit_code)
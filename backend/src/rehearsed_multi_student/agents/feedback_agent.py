@@ -1,14 +1,22 @@
 """Feedback agent for analyzing teacher mathematical discourse."""
-import json
+import asyncio
+import io
+from collections import OrderedDict, deque
 from typing import List, Optional
-from google import genai
 from google.genai import types
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from ..models.student_agent import StudentResponse
 from ..models.domain import ConversationMessage
 from ..models.lesson_analyzer import LessonContext
 from ..models.feedback_agent import TeacherFeedback
 from ..prompts import get_feedback_system_prompt
+from ..services.gemini_client import get_gemini_client
+
+# Hand-status marker rendered into the analysis prompt for silent students
+_DID_NOT_RAISE_HAND = "(did not raise hand)"
+
+# Most recent analyses kept for repeated teacher moves
+_FEEDBACK_CACHE_MAX_ENTRIES = 64
 
 
 class FeedbackAnalysisOutput(BaseModel):
@@ -35,12 +43,50 @@ class FeedbackAgent:
     
     def __init__(self):
         """Initialize feedback agent with Gemini."""
-        self.client = genai.Client(
-            vertexai=True,
-            project="upbeat-lexicon-411217",
-            location="us-central1"
-        )
+        self.client = get_gemini_client()
         self.model_id = "gemini-2.5-flash"
+        # Last rendered lesson-context fragment, keyed by the context object
+        # itself (holding the reference keeps identity comparison safe)
+        self._lesson_context_cache: Optional[tuple[LessonContext, str]] = None
+        # In-flight analyses keyed by rendered prompt, so concurrent
+        # identical calls share one request
+        self._inflight: dict = {}
+        # LRU of completed analyses keyed by the rendered prompt: feedback
+        # is a deterministic assessment of its full input, so replaying it
+        # for an identical prompt is correct — unlike student responses,
+        # which should vary
+        self._feedback_cache: OrderedDict[str, TeacherFeedback] = OrderedDict()
+
+    def _render_lesson_context(self, lesson_context: LessonContext) -> str:
+        """Render the lesson-context prompt fragment, memoized by identity.
+
+        The same LessonContext instance is reused for every turn of a
+        session, so the fragment only needs to be rendered once per context.
+
+        Args:
+            lesson_context: The lesson being taught
+
+        Returns:
+            Rendered prompt fragment (problem, context, student approaches)
+        """
+        cached = self._lesson_context_cache
+        if cached is not None and cached[0] is lesson_context:
+            return cached[1]
+
+        fragment_buffer = io.StringIO()
+        fragment_buffer.write(f"**Mathematical Problem:** {lesson_context.mathematical_problem}\n\n")
+        fragment_buffer.write(f"**Problem Context:** {lesson_context.context_summary}\n\n")
+
+        if lesson_context.student_approaches:
+            fragment_buffer.write("**Student Approaches to This Problem:**")
+            for student_id, approach in lesson_context.student_approaches.items():
+                fragment_buffer.write(f"\n\n- **{approach.student_name}** ({approach.learning_style} learner):")
+                fragment_buffer.write(f"\n  How they think about this problem: {approach.thinking_approach}")
+            fragment_buffer.write("\n\n")
+
+        fragment = fragment_buffer.getvalue()
+        self._lesson_context_cache = (lesson_context, fragment)
+        return fragment
     
     async def analyze_teacher_move(
         self,
@@ -66,46 +112,76 @@ class FeedbackAgent:
         Returns:
             TeacherFeedback with question classification, feedback, and suggestion
         """
-        
-        # Build the prompt context with all necessary information
-        prompt_parts = []
-        
-        # Mathematical problem
-        if lesson_context:
-            prompt_parts.append(f"**Mathematical Problem:** {lesson_context.mathematical_problem}\n")
-            prompt_parts.append(f"**Problem Context:** {lesson_context.context_summary}\n")
-        
-        # Student approaches
-        if lesson_context and lesson_context.student_approaches:
-            prompt_parts.append("**Student Approaches to This Problem:**")
-            for student_id, approach in lesson_context.student_approaches.items():
-                prompt_parts.append(f"\n- **{approach.student_name}** ({approach.learning_style} learner):")
-                prompt_parts.append(f"  How they think about this problem: {approach.thinking_approach}")
-            prompt_parts.append("")
-        
-        # Conversation history
-        if conversation_history:
-            prompt_parts.append("**Recent Conversation:**")
-            for msg in conversation_history[-8:]:  # Last 4 exchanges
-                prompt_parts.append(f"  {msg.speaker}: {msg.message}")
-            prompt_parts.append("")
-        
-        # Latest teacher statement
-        prompt_parts.append(f"**Teacher's Most Recent Statement:**\n{latest_teacher_statement}\n")
-        
-        # Student responses
-        prompt_parts.append("**How Students Responded:**")
-        for response in student_responses:
-            if response.would_raise_hand and response.response:
-                prompt_parts.append(f"\n- {response.student_name}: \"{response.response}\"")
-                prompt_parts.append(f"  Thinking: {response.thinking_process[:80]}...")
-            else:
-                prompt_parts.append(f"\n- {response.student_name}: (did not raise hand)")
-        
-        analysis_prompt = "\n".join(prompt_parts)
-        
-        # Generate feedback with schema validation
-        response = await self.client.aio.models.generate_content(
+        # The rendered prompt is the complete analysis input (lesson
+        # fragment, trailing history, statement, responses), so it is the
+        # key for both caches: anything that would change the prompt sent
+        # to Gemini misses, and nothing else does
+        analysis_prompt = self._build_analysis_prompt(
+            latest_teacher_statement,
+            student_responses,
+            conversation_history,
+            lesson_context,
+        )
+
+        cached_feedback = self._feedback_cache.get(analysis_prompt)
+        if cached_feedback is not None:
+            self._feedback_cache.move_to_end(analysis_prompt)
+            return cached_feedback
+
+        # Coalesce concurrent duplicate analyses (e.g. a double-submitted
+        # teacher turn) onto a single in-flight Gemini request
+        task = self._inflight.get(analysis_prompt)
+        if task is None:
+            task = asyncio.create_task(
+                self._analyze_teacher_move(analysis_prompt, student_responses)
+            )
+            self._inflight[analysis_prompt] = task
+            task.add_done_callback(
+                lambda _: self._inflight.pop(analysis_prompt, None)
+            )
+
+        # Shield the shared task so a cancelled duplicate request (client
+        # abort) doesn't cancel the analysis for the surviving request
+        feedback = await asyncio.shield(task)
+        self._feedback_cache[analysis_prompt] = feedback
+        if len(self._feedback_cache) > _FEEDBACK_CACHE_MAX_ENTRIES:
+            self._feedback_cache.popitem(last=False)
+        return feedback
+
+    async def _analyze_teacher_move(
+        self,
+        analysis_prompt: str,
+        student_responses: List[StudentResponse],
+    ) -> TeacherFeedback:
+        """Run the actual Gemini analysis behind the in-flight cache.
+
+        Args:
+            analysis_prompt: Rendered prompt from _build_analysis_prompt
+            student_responses: How students responded (for the no-hands check)
+
+        Returns:
+            TeacherFeedback with question classification, feedback, and suggestion
+        """
+
+        # Skip the model call entirely when no student engaged - there is no
+        # student thinking to ground the analysis in
+        if student_responses and not any(r.would_raise_hand for r in student_responses):
+            return TeacherFeedback(
+                question_type=None,
+                feedback=(
+                    "None of the students raised their hand in response to your "
+                    "statement, so there isn't any student thinking to build on yet."
+                ),
+                suggestion=(
+                    "Consider rephrasing with a lower-stakes entry point - for "
+                    "example, ask students to describe what they notice about the "
+                    "problem before asking for an answer."
+                ),
+            )
+
+        # Generate feedback with schema validation, streaming chunks as
+        # Gemini produces them instead of waiting on the buffered response
+        stream = await self.client.aio.models.generate_content_stream(
             model=self.model_id,
             contents=analysis_prompt,
             config=types.GenerateContentConfig(
@@ -115,19 +191,76 @@ class FeedbackAgent:
                 response_schema=FeedbackAnalysisOutput,
             )
         )
-        
-        # Parse structured output
+
+        text_chunks = []
+        async for chunk in stream:
+            if chunk.text:
+                text_chunks.append(chunk.text)
+
+        # Parse structured output from the accumulated stream
         try:
-            feedback_output = FeedbackAnalysisOutput.model_validate_json(response.text)
+            feedback_output = FeedbackAnalysisOutput.model_validate_json("".join(text_chunks))
             return TeacherFeedback(
                 question_type=feedback_output.question_type,
                 feedback=feedback_output.feedback,
                 suggestion=feedback_output.suggestion
             )
-        except (json.JSONDecodeError, Exception):
-            # Fallback if parsing fails
+        except ValidationError:
+            # Fallback if the model returned malformed JSON; API errors now
+            # propagate to the caller instead of being masked as bad parses
             return TeacherFeedback(
                 question_type=None,
                 feedback="Feedback analysis in progress. Please try again.",
                 suggestion="Consider asking a follow-up question to deepen student thinking."
             )
+
+    def _build_analysis_prompt(
+        self,
+        latest_teacher_statement: str,
+        student_responses: List[StudentResponse],
+        conversation_history: Optional[List[ConversationMessage]] = None,
+        lesson_context: Optional[LessonContext] = None
+    ) -> str:
+        """Build the analysis prompt from lesson context, history, and responses.
+
+        Args:
+            latest_teacher_statement: The teacher's most recent statement
+            student_responses: How students responded to that statement
+            conversation_history: Prior conversation for context
+            lesson_context: The lesson being taught
+
+        Returns:
+            Prompt string for the feedback analysis call
+        """
+        # Build the prompt context in a single growable buffer rather than
+        # accumulating a list of fragments and joining at the end
+        prompt_buffer = io.StringIO()
+
+        # Mathematical problem, context, and student approaches (memoized per
+        # lesson context since it does not change between turns)
+        if lesson_context:
+            prompt_buffer.write(self._render_lesson_context(lesson_context))
+
+        # Conversation history
+        if conversation_history:
+            prompt_buffer.write("**Recent Conversation:**")
+            # Last 4 exchanges, without copying the full history list
+            for msg in deque(conversation_history, maxlen=8):
+                prompt_buffer.write(f"\n  {msg.as_line()}")
+            prompt_buffer.write("\n\n")
+
+        # Latest teacher statement
+        prompt_buffer.write(f"**Teacher's Most Recent Statement:**\n{latest_teacher_statement}\n\n")
+
+        # Student responses
+        prompt_buffer.write("**How Students Responded:**")
+        for response in student_responses:
+            if response.would_raise_hand and response.response:
+                prompt_buffer.write(
+                    f"\n\n- {response.student_name}: \"{response.response}\""
+                    f"\n  Thinking: {response.thinking_process[:80]}..."
+                )
+            else:
+                prompt_buffer.write(f"\n\n- {response.student_name}: {_DID_NOT_RAISE_HAND}")
+
+        return prompt_buffer.getvalue()
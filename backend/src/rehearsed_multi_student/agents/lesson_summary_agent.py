@@ -1,7 +1,9 @@
 """Agent for generating comprehensive end-of-lesson feedback."""
+import hashlib
+import io
 import json
+from collections import OrderedDict
 from typing import List
-from google import genai
 from google.genai import types
 from ..models.domain import ConversationMessage
 from ..models.lesson_analyzer import LessonContext
@@ -13,6 +15,10 @@ from ..models.lesson_summary_agent import (
     LessonSummaryOutput,
 )
 from ..prompts import get_lesson_summary_system_prompt
+from ..services.gemini_client import get_gemini_client
+
+# Most recent (context, transcript) summaries kept for replayed requests
+_SUMMARY_CACHE_MAX_ENTRIES = 32
 
 
 class LessonSummaryAgent:
@@ -20,13 +26,13 @@ class LessonSummaryAgent:
     
     def __init__(self):
         """Initialize lesson summary agent with Gemini."""
-        self.client = genai.Client(
-            vertexai=True,
-            project="upbeat-lexicon-411217",
-            location="us-central1"
-        )
+        self.client = get_gemini_client()
         self.model_id = "gemini-2.5-flash"
-    
+        # LRU cache of generated summaries keyed by a hash of the rendered
+        # lesson context + transcript, so a re-submitted end-of-lesson
+        # request replays the stored summary instead of a Gemini call
+        self._summary_cache: OrderedDict[str, EndLessonResponse] = OrderedDict()
+
     async def generate_lesson_summary(
         self,
         lesson_context: LessonContext,
@@ -42,40 +48,52 @@ class LessonSummaryAgent:
         Returns:
             EndLessonResponse with summary, feedback, and next steps
         """
-        # Build the complete context
-        context_parts = [
-            "**LESSON CONTEXT:**",
-            f"Grade Level: {lesson_context.grade_level}",
-            f"Subject: {lesson_context.subject}",
-            f"Topic: {lesson_context.topic}",
-            "",
-            "**Learning Objectives:**",
-            *[f"- {obj}" for obj in lesson_context.learning_objectives],
-            "",
-            "**Key Concepts:**",
-            ", ".join(lesson_context.key_concepts),
-            "",
-            f"**Developmental Context:** {lesson_context.context_summary}",
-            "",
-            "---",
-            "",
-            "**COMPLETE LESSON TRANSCRIPT:**",
-            ""
-        ]
-        
+        # Build the complete context in one growable buffer instead of
+        # accumulating a fragment list and joining at the end
+        context_buffer = io.StringIO()
+        context_buffer.write(
+            "**LESSON CONTEXT:**\n"
+            f"Grade Level: {lesson_context.grade_level}\n"
+            f"Subject: {lesson_context.subject}\n"
+            f"Topic: {lesson_context.topic}\n"
+            "\n"
+            "**Learning Objectives:**\n"
+        )
+        for obj in lesson_context.learning_objectives:
+            context_buffer.write(f"- {obj}\n")
+        context_buffer.write(
+            "\n"
+            "**Key Concepts:**\n"
+            f"{', '.join(lesson_context.key_concepts)}\n"
+            "\n"
+            f"**Developmental Context:** {lesson_context.context_summary}\n"
+            "\n"
+            "---\n"
+            "\n"
+            "**COMPLETE LESSON TRANSCRIPT:**\n"
+            "\n"
+        )
+
         # Add full transcript
         for i, msg in enumerate(conversation_transcript, 1):
-            context_parts.append(f"{i}. **{msg.speaker}:** {msg.message}")
-        
-        context_parts.extend([
-            "",
-            "---",
-            "",
+            context_buffer.write(f"{i}. **{msg.speaker}:** {msg.message}\n")
+
+        context_buffer.write(
+            "\n"
+            "---\n"
+            "\n"
             "Analyze this lesson and provide comprehensive feedback following the framework above."
-        ])
-        
-        analysis_context = "\n".join(context_parts)
-        
+        )
+
+        analysis_context = context_buffer.getvalue()
+
+        # Serve an identical (context, transcript) replay from the cache
+        cache_key = hashlib.sha256(analysis_context.encode()).hexdigest()
+        cached_summary = self._summary_cache.get(cache_key)
+        if cached_summary is not None:
+            self._summary_cache.move_to_end(cache_key)
+            return cached_summary
+
         # Generate comprehensive feedback
         response = await self.client.aio.models.generate_content(
             model=self.model_id,
@@ -88,17 +106,34 @@ class LessonSummaryAgent:
             )
         )
         
-        # Parse structured output
+        # Parse structured output - the SDK already validates against the
+        # response schema, so prefer the pre-parsed model over re-parsing text
         try:
-            feedback_output = LessonSummaryOutput.model_validate_json(response.text)
-            
-            return EndLessonResponse(
-                lesson_summary=LessonSummary(**feedback_output.lesson_summary.model_dump()),
+            feedback_output = response.parsed
+            if not isinstance(feedback_output, LessonSummaryOutput):
+                feedback_output = LessonSummaryOutput.model_validate_json(response.text)
+
+            # The response models mirror the output schema field-for-field, so
+            # validate straight from attributes without a model_dump round trip
+            summary = EndLessonResponse(
+                lesson_summary=LessonSummary.model_validate(
+                    feedback_output.lesson_summary, from_attributes=True
+                ),
                 overall_feedback=feedback_output.overall_feedback,
-                strengths_and_growth=StrengthsAndGrowth(**feedback_output.strengths_and_growth.model_dump()),
-                next_steps=NextSteps(**feedback_output.next_steps.model_dump()),
+                strengths_and_growth=StrengthsAndGrowth.model_validate(
+                    feedback_output.strengths_and_growth, from_attributes=True
+                ),
+                next_steps=NextSteps.model_validate(
+                    feedback_output.next_steps, from_attributes=True
+                ),
                 celebration=feedback_output.celebration
             )
+
+            self._summary_cache[cache_key] = summary
+            if len(self._summary_cache) > _SUMMARY_CACHE_MAX_ENTRIES:
+                self._summary_cache.popitem(last=False)
+
+            return summary
         except (json.JSONDecodeError, KeyError, Exception) as e:
             # Fallback if parsing fails
             raise ValueError(f"Failed to parse lesson summary: {str(e)}\nResponse: {response.text}")
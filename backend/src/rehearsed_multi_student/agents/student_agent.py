@@ -1,16 +1,31 @@
 """Student agent implementation using Google GenAI."""
 
 import asyncio
+import logging
 import os
 from typing import List, Optional
-from google import genai
-from google.genai import types
+from google.genai import errors, types
+from pydantic import ValidationError
+from pydantic_core import from_json
 
 from rehearsed_multi_student.models.domain import StudentProfile, ConversationMessage
 from rehearsed_multi_student.models.student_agent import StudentResponse, TeacherPromptRequest
 from rehearsed_multi_student.models.lesson_analyzer import LessonContext
+from rehearsed_multi_student.services.gemini_client import get_gemini_client
 from ..prompts import build_student_system_prompt
 
+# Cap on concurrent Gemini calls across all student agents, so a burst of
+# requests queues here instead of overwhelming the shared client's
+# connection pool (transport reuse itself comes from the shared client)
+_GEMINI_CONCURRENCY_LIMIT = int(os.getenv("STUDENT_AGENT_CONCURRENCY", "8"))
+_gemini_semaphore = asyncio.Semaphore(_GEMINI_CONCURRENCY_LIMIT)
+
+# Deadline for one student's Gemini call; without it a single hung RPC
+# holds up the whole classroom fan-out for the default gRPC deadline
+_GEMINI_TIMEOUT_SECONDS = float(os.getenv("STUDENT_AGENT_TIMEOUT", "30"))
+
+logger = logging.getLogger(__name__)
+
 
 class StudentAgent:
     """An AI agent representing a single student with a specific profile."""
@@ -25,12 +40,22 @@ class StudentAgent:
             model_name: The Gemini model to use (default: gemini-2.5-flash-lite)
         """
         self.profile = profile
-        # Use Vertex AI with Application Default Credentials
-        project = os.getenv("GOOGLE_CLOUD_PROJECT", "upbeat-lexicon-411217")
-        self.client = genai.Client(
-            vertexai=True, project=project, location="us-central1"
-        )
+        # Use the shared Vertex AI client (Application Default Credentials)
+        self.client = get_gemini_client()
         self.model_name = model_name
+        # Validate the constant generation settings once; per-call configs
+        # are cheap model_copy updates of this template
+        self._config_template = types.GenerateContentConfig(
+            temperature=0.7,
+            response_mime_type="application/json",
+            response_schema=StudentResponse,
+        )
+        # In-flight calls keyed by (system prompt, teacher prompt), so
+        # concurrent bit-identical requests share one Gemini round-trip
+        self._inflight: dict = {}
+        # Last rendered system prompt with the inputs it was rendered from
+        # (references held so identity comparison stays safe)
+        self._prompt_cache: Optional[tuple] = None
 
     def _build_system_prompt(
         self,
@@ -46,18 +71,43 @@ class StudentAgent:
         Returns:
             System prompt string
         """
+        # Across turns the lesson context is the same object and history only
+        # grows, so (context, length, last message) identifies the rendered
+        # prompt; skip the rebuild when nothing changed
+        history_len = len(conversation_history) if conversation_history else 0
+        last_message = conversation_history[-1] if conversation_history else None
+        cached = self._prompt_cache
+        if (
+            cached is not None
+            and cached[0] is lesson_context
+            and cached[1] == history_len
+            and cached[2] is last_message
+        ):
+            return cached[3]
+
         # Extract this student's approach from lesson context if available
         student_approach = None
         if lesson_context and self.profile.id in lesson_context.student_approaches:
             student_approach = lesson_context.student_approaches[self.profile.id]
-        
-        return build_student_system_prompt(
+
+        system_prompt = build_student_system_prompt(
             self.profile, lesson_context, conversation_history, student_approach
         )
+        self._prompt_cache = (
+            lesson_context,
+            history_len,
+            last_message,
+            system_prompt,
+        )
+        return system_prompt
 
     async def process_prompt(self, request: TeacherPromptRequest) -> StudentResponse:
         """Process a teacher's prompt and generate student response.
 
+        Concurrent calls with identical inputs are coalesced onto a single
+        in-flight Gemini request; each caller gets its own copy of the
+        shared result.
+
         Args:
             request: The teacher's prompt request
 
@@ -68,22 +118,69 @@ class StudentAgent:
             request.lesson_context, request.conversation_history
         )
 
-        try:
-            # Call Gemini API with proper Pydantic schema validation
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
-                model=self.model_name,
-                contents=request.prompt,
-                config=types.GenerateContentConfig(
-                    system_instruction=system_prompt,
-                    temperature=0.7,
-                    response_mime_type="application/json",
-                    response_schema=StudentResponse,
-                ),
+        dedup_key = (system_prompt, request.prompt)
+        task = self._inflight.get(dedup_key)
+        if task is None:
+            task = asyncio.create_task(
+                self._process_prompt(system_prompt, request.prompt)
+            )
+            self._inflight[dedup_key] = task
+            task.add_done_callback(
+                lambda _t: self._inflight.pop(dedup_key, None)
             )
 
-            # Parse response and create StudentResponse with student identity
-            student_response = StudentResponse.model_validate_json(response.text)
+        # Shield the shared task so one cancelled caller (client abort on a
+        # double-submit) doesn't cancel the Gemini call out from under the
+        # coalesced survivors. Copy so callers can't mutate each other's
+        # response (audio attachment happens downstream).
+        return (await asyncio.shield(task)).model_copy()
+
+    async def _process_prompt(
+        self, system_prompt: str, prompt: str
+    ) -> StudentResponse:
+        """Run one Gemini call and parse the student's response.
+
+        Args:
+            system_prompt: Rendered system prompt for this student
+            prompt: The teacher's prompt text
+
+        Returns:
+            StudentResponse with decision and potential answer
+        """
+        try:
+            # Call Gemini API with proper Pydantic schema validation, using
+            # the SDK's async surface and consuming the response as a stream
+            # instead of waiting on the buffered payload. The deadline starts
+            # once the semaphore is acquired: it bounds the Gemini call's
+            # tail latency, not time spent queued behind the concurrency cap
+            async with _gemini_semaphore:
+                async with asyncio.timeout(_GEMINI_TIMEOUT_SECONDS):
+                    stream = await self.client.aio.models.generate_content_stream(
+                        model=self.model_name,
+                        contents=prompt,
+                        config=self._config_template.model_copy(
+                            update={"system_instruction": system_prompt}
+                        ),
+                    )
+                    text_chunks = []
+                    async for chunk in stream:
+                        if chunk.text:
+                            text_chunks.append(chunk.text)
+            response_text = "".join(text_chunks)
+
+            # Parse the accumulated stream; on a truncated stream, salvage
+            # the fields that did arrive via a partial JSON parse
+            try:
+                student_response = StudentResponse.model_validate_json(response_text)
+            except ValidationError:
+                partial = from_json(response_text, allow_partial=True)
+                if not isinstance(partial, dict):
+                    # Valid JSON but not an object (array, string, null) -
+                    # nothing to salvage; re-raise into the fallback below
+                    raise
+                partial.setdefault("student_id", self.profile.id)
+                partial.setdefault("student_name", self.profile.name)
+                student_response = StudentResponse.model_validate(partial)
             
             # Ensure student ID and name are set correctly
             student_response.student_id = self.profile.id
@@ -91,9 +188,11 @@ class StudentAgent:
             
             return student_response
 
-        except Exception as e:
-            # Fallback response in case of error
-            print(f"Error processing prompt for {self.profile.name}: {e}")
+        except (errors.APIError, ValidationError, ValueError, TimeoutError) as e:
+            # Fallback response for API failures, timeouts, or unparseable
+            # model output; anything else (cancellation, programming errors)
+            # propagates
+            logger.exception("Error processing prompt for %s", self.profile.name)
             return StudentResponse(
                 student_id=self.profile.id,
                 student_name=self.profile.name,
@@ -118,40 +217,112 @@ class ParallelStudentOrchestrator:
         self.profiles = {profile.id: profile for profile in profiles}
         self.tts_service = tts_service
 
+    async def _process_with_audio(
+        self,
+        agent: StudentAgent,
+        request: TeacherPromptRequest,
+        audio_as_url: bool = False,
+    ) -> StudentResponse:
+        """Generate a student's text response, then their audio.
+
+        Chaining text and audio per student lets each student's speech
+        synthesis start as soon as their own text lands, instead of waiting
+        for the slowest student in the class.
+
+        Args:
+            agent: The student agent to run
+            request: The teacher's prompt request
+            audio_as_url: Deliver audio as a fetch URL instead of base64
+
+        Returns:
+            StudentResponse with audio attached when there is text to speak
+        """
+        response = await agent.process_prompt(request)
+        if response.response:  # Only generate audio if there's text
+            profile = self.profiles[response.student_id]
+            if audio_as_url:
+                response.audio_url = await self.tts_service.synthesize_speech(
+                    response.response, profile.voice_settings, as_url=True
+                )
+            else:
+                response.audio_base64 = await self.tts_service.synthesize_speech(
+                    response.response, profile.voice_settings
+                )
+        return response
+
+    async def process_prompt_stream(
+        self,
+        request: TeacherPromptRequest,
+        include_audio: bool = False,
+        audio_as_url: bool = False,
+    ):
+        """Yield each student's response as it completes.
+
+        Responses arrive in completion order, not roster order, so the
+        first (fastest) student reaches the caller without waiting for the
+        slowest. Use process_prompt_parallel when roster ordering matters.
+
+        Args:
+            request: The teacher's prompt request
+            include_audio: Whether to generate audio for responses
+            audio_as_url: Deliver audio as fetch URLs instead of base64
+
+        Yields:
+            StudentResponse for each student, fastest first
+        """
+        if include_audio and self.tts_service:
+            coros = [
+                self._process_with_audio(agent, request, audio_as_url)
+                for agent in self.agents
+            ]
+        else:
+            coros = [agent.process_prompt(request) for agent in self.agents]
+
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            # If the consumer stops early (client disconnect), don't leave
+            # the remaining student calls running
+            for task in tasks:
+                task.cancel()
+
     async def process_prompt_parallel(
-        self, request: TeacherPromptRequest, include_audio: bool = False
+        self,
+        request: TeacherPromptRequest,
+        include_audio: bool = False,
+        audio_as_url: bool = False,
     ) -> List[StudentResponse]:
         """Process a prompt with all student agents in parallel.
 
         Args:
             request: The teacher's prompt request
             include_audio: Whether to generate audio for responses
+            audio_as_url: Deliver audio as fetch URLs instead of base64
 
         Returns:
             List of student responses (with audio if include_audio=True)
         """
-        # Get text responses in parallel
-        tasks = [agent.process_prompt(request) for agent in self.agents]
-        responses = await asyncio.gather(*tasks)
-
-        # Generate audio in parallel if requested
-        if include_audio and self.tts_service:
-            audio_tasks = []
-            for response in responses:
-                if response.response:  # Only generate audio if there's text
-                    profile = self.profiles[response.student_id]
-                    audio_tasks.append(
-                        self.tts_service.synthesize_speech(
-                            response.response, profile.voice_settings
-                        )
+        # TaskGroup gives structured cancellation: if the caller is cancelled
+        # (e.g. a dropped SSE connection), the per-student waiter tasks are
+        # cancelled with it instead of leaking. The underlying Gemini calls
+        # sit behind asyncio.shield in process_prompt and deliberately run to
+        # completion, so coalesced callers on other requests keep their
+        # results. Gemini concurrency itself is bounded by the module-level
+        # semaphore.
+        async with asyncio.TaskGroup() as tg:
+            if include_audio and self.tts_service:
+                tasks = [
+                    tg.create_task(
+                        self._process_with_audio(agent, request, audio_as_url)
                     )
-                else:
-                    audio_tasks.append(asyncio.sleep(0, result=None))
-
-            audio_results = await asyncio.gather(*audio_tasks)
-
-            # Attach audio to responses
-            for response, audio_base64 in zip(responses, audio_results):
-                response.audio_base64 = audio_base64
+                    for agent in self.agents
+                ]
+            else:
+                tasks = [
+                    tg.create_task(agent.process_prompt(request))
+                    for agent in self.agents
+                ]
 
-        return list(responses)
+        return [task.result() for task in tasks]
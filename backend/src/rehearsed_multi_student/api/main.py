@@ -1,15 +1,21 @@
 """FastAPI application for the multi-student agent system."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pathlib import Path
-import json
+from starlette.background import BackgroundTask
+import orjson
 import asyncio
 import os
 import logging
+import re
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+from itertools import count
 import time
 
 from rehearsed_multi_student.models.student_agent import (
@@ -28,7 +34,10 @@ from rehearsed_multi_student.profiles.loader import ProfileLoader
 from rehearsed_multi_student.agents.student_agent import ParallelStudentOrchestrator
 from rehearsed_multi_student.agents.feedback_agent import FeedbackAgent
 from rehearsed_multi_student.agents.lesson_summary_agent import LessonSummaryAgent
-from rehearsed_multi_student.services.tts_service import TextToSpeechService
+from rehearsed_multi_student.services.tts_service import (
+    TextToSpeechService,
+    get_stored_audio,
+)
 from rehearsed_multi_student.services.lesson_analyzer import LessonAnalyzer
 
 
@@ -68,11 +77,55 @@ logger = setup_logging()
 # FASTAPI APP INITIALIZATION
 # ============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Construct service singletons at worker startup, not module import.
+
+    The constructors touch credentials and network clients, so deferring
+    them keeps import cheap (forks, test collection) and running them
+    concurrently overlaps their setup I/O.
+    """
+    global tts_service, feedback_agent, lesson_summary_agent
+    global lesson_analyzer, orchestrator
+
+    logger.info("Initializing services...")
+    (
+        tts_service,
+        feedback_agent,
+        lesson_summary_agent,
+        lesson_analyzer,
+    ) = await asyncio.gather(
+        asyncio.to_thread(TextToSpeechService),
+        asyncio.to_thread(FeedbackAgent),
+        asyncio.to_thread(LessonSummaryAgent),
+        asyncio.to_thread(LessonAnalyzer),
+    )
+    orchestrator = ParallelStudentOrchestrator(profiles, tts_service)
+    logger.info("All services initialized successfully")
+
+    # One preformatted record instead of seven separate ones
+    logger.info(
+        "\n%s\nRehearsed Multi-Student API - Starting Up"
+        "\nEnvironment: %s\nLog Level: %s\nStudents Loaded: %d\n%s",
+        "=" * 80,
+        os.getenv("ENVIRONMENT", "development"),
+        os.getenv("LOG_LEVEL", "INFO"),
+        len(profiles),
+        "=" * 80,
+    )
+
+    yield
+
+    logger.info("Rehearsed Multi-Student API - Shutting Down")
+
+
 app = FastAPI(
     title="Rehearsed Multi-Student API",
     description="Parallel student agent system for teacher training",
     version="0.1.0",
-    root_path="/api"
+    root_path="/api",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -80,19 +133,24 @@ app = FastAPI(
 # CORS CONFIGURATION
 # ============================================================================
 
+# Anchored with bounded quantifiers so a hostile Origin header can't trigger
+# regex backtracking; compiled here so a bad pattern fails at import, not on
+# the first preflight
+_DEFAULT_CORS_RE = re.compile(
+    r"\Ahttps://(?:[a-f0-9]{1,64}-[a-f0-9]{1,64}\.fly\.dev|"
+    r"multi-agent-frontend-847407960490\.us-central1\.run\.app|"
+    r"builder\.io|cdn\.builder\.io)\Z"
+)
+
+
 def get_cors_config():
     """
     Get CORS configuration supporting both static and dynamic origins.
-    
+
     Supports Fly.dev dynamic preview URLs with regex pattern matching.
     """
     # Use regex pattern to match Fly.dev preview URLs and other allowed domains
-    cors_regex = os.getenv(
-        "CORS_ORIGIN_REGEX",
-        r"https://([a-f0-9]+-[a-f0-9]+\.fly\.dev|"
-        r"multi-agent-frontend-847407960490\.us-central1\.run\.app|"
-        r"builder\.io|cdn\.builder\.io)"
-    )
+    cors_regex = os.getenv("CORS_ORIGIN_REGEX", _DEFAULT_CORS_RE.pattern)
     
     logger.info(f"CORS configuration - Origin regex: {cors_regex}")
     
@@ -108,46 +166,73 @@ def get_cors_config():
 # Add CORS middleware
 app.add_middleware(CORSMiddleware, **get_cors_config())
 
+# Compress large bodies for clients that accept it; base64 audio gzips back
+# most of its 33% inflation, and sub-1KB bodies pass through untouched.
+# SSE is not affected: starlette excludes text/event-stream from compression
+# entirely, so event delivery stays incremental. Compression runs on the
+# event loop, so use a moderate compresslevel instead of the default 9 —
+# the multi-MB /ask/with-audio body is the common large case and level 6
+# compresses base64 audio nearly as well at a fraction of the CPU.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
 
 # ============================================================================
 # REQUEST LOGGING MIDDLEWARE
 # ============================================================================
 
+# Collision-free request ids: a per-process monotonic counter with a pid
+# prefix so ids stay unique across workers (the old millisecond timestamp
+# collided for requests landing in the same ms)
+_REQUEST_ID_PREFIX = f"{os.getpid():x}"
+_next_request_seq = count(1).__next__
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all incoming requests and responses with timing."""
-    request_id = f"{int(time.time() * 1000)}"
-    start_time = time.time()
-    
-    # Log incoming request
+    request_id = f"{_REQUEST_ID_PREFIX}-{_next_request_seq():x}"
+    # Monotonic clock for durations: immune to clock adjustments and cheaper
+    # than time.time() per call
+    start_ns = time.perf_counter_ns()
+
+    # %s-style args defer string formatting until a handler accepts the record
     logger.info(
-        f"[{request_id}] {request.method} {request.url.path} "
-        f"- Origin: {request.headers.get('origin', 'N/A')}"
+        "[%s] %s %s - Origin: %s",
+        request_id,
+        request.method,
+        request.url.path,
+        request.headers.get("origin", "N/A"),
     )
-    
+
     try:
         response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Log response
+
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+
         logger.info(
-            f"[{request_id}] {request.method} {request.url.path} "
-            f"- Status: {response.status_code} - Duration: {duration:.3f}s"
+            "[%s] %s %s - Status: %s - Duration: %dms",
+            request_id,
+            request.method,
+            request.url.path,
+            response.status_code,
+            duration_ms,
         )
-        
+
         # Add request ID to response headers
         response.headers["X-Request-ID"] = request_id
-        
+
         return response
-        
+
     except Exception as e:
-        duration = time.time() - start_time
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
         logger.error(
-            f"[{request_id}] {request.method} {request.url.path} "
-            f"- Error: {str(e)} - Duration: {duration:.3f}s",
-            exc_info=True
+            "[%s] %s %s - Error: %s - Duration: %dms",
+            request_id,
+            request.method,
+            request.url.path,
+            e,
+            duration_ms,
+            exc_info=True,
         )
         raise
 
@@ -163,49 +248,90 @@ profile_loader = ProfileLoader(profiles_dir)
 # Load all student profiles on startup
 logger.info("Loading student profiles...")
 profiles = profile_loader.load_all_profiles()
-logger.info(f"Loaded {len(profiles)} student profiles")
+logger.info("Loaded %d student profiles", len(profiles))
+
+# Service singletons are populated by the lifespan handler at worker
+# startup; only the (cheap, filesystem-backed) profiles load at import
+tts_service = None
+feedback_agent = None
+lesson_summary_agent = None
+lesson_analyzer = None
+orchestrator = None
+
+# Profiles are immutable after startup, so the /students payload is
+# serialized exactly once and served as static bytes
+_STUDENTS_BYTES = orjson.dumps(
+    {
+        "students": [
+            {
+                "id": p.id,
+                "name": p.name,
+                "learning_style": p.learning_style,
+                "description": p.description,
+            }
+            for p in profiles
+        ]
+    }
+)
 
-# Initialize services
-logger.info("Initializing services...")
-tts_service = TextToSpeechService()
-feedback_agent = FeedbackAgent()
-lesson_summary_agent = LessonSummaryAgent()
-lesson_analyzer = LessonAnalyzer()
-orchestrator = ParallelStudentOrchestrator(profiles, tts_service)
-logger.info("All services initialized successfully")
+
+# ============================================================================
+# SSE HELPERS
+# ============================================================================
+
+# Static completion frame shared by every SSE stream
+_SSE_DONE_FRAME = b"event: done\ndata: {}\n\n"
+
+
+def _dump_json_bytes(model) -> bytes:
+    """Serialize a Pydantic model to JSON bytes via its compiled serializer.
+
+    Skips the intermediate str that model_dump_json would allocate, which
+    matters for audio payloads running to several megabytes.
+    """
+    return model.__pydantic_serializer__.to_json(model)
+
+
+def _sse_event(event: bytes, data: bytes) -> bytes:
+    """Frame one SSE event as a single bytes chunk (one write per event)."""
+    return b"event: " + event + b"\ndata: " + data + b"\n\n"
 
 
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
 
+# Health probes hit / many times per second; format the timestamp at most
+# once per wall-clock second
+_health_ts_cache: list = [0, ""]
+
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
     logger.debug("Health check requested")
+    now = int(time.time())
+    if now != _health_ts_cache[0]:
+        _health_ts_cache[0] = now
+        # tzinfo stripped to keep the previous suffix-free timestamp format
+        _health_ts_cache[1] = (
+            datetime.fromtimestamp(now, tz=timezone.utc)
+            .replace(tzinfo=None)
+            .isoformat()
+        )
     return {
         "status": "ok",
         "message": "Rehearsed Multi-Student API is running",
         "students_loaded": len(profiles),
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _health_ts_cache[1],
     }
 
 
 @app.get("/students")
 async def list_students():
     """List all available student profiles."""
-    logger.info(f"Student list requested - returning {len(profiles)} profiles")
-    return {
-        "students": [
-            {
-                "id": p.id,
-                "name": p.name,
-                "learning_style": p.learning_style,
-                "description": p.description,
-            }
-            for p in profiles
-        ]
-    }
+    logger.info("Student list requested - returning %d profiles", len(profiles))
+    return Response(content=_STUDENTS_BYTES, media_type="application/json")
 
 
 @app.post("/ask")
@@ -227,7 +353,7 @@ async def ask_students(request: TeacherPromptRequest, stream_feedback: bool = Fa
         - If stream_feedback=False: JSON with student responses
         - If stream_feedback=True: SSE stream with students first, then feedback
     """
-    logger.info(f"Processing /ask request - Prompt: {request.prompt[:100]}... - Stream feedback: {stream_feedback}")
+    logger.info("Processing /ask request - Prompt: %.100s... - Stream feedback: %s", request.prompt, stream_feedback)
     
     try:
         # Process prompt with all agents in parallel (text only)
@@ -235,59 +361,69 @@ async def ask_students(request: TeacherPromptRequest, stream_feedback: bool = Fa
         student_responses = await orchestrator.process_prompt_parallel(
             request, include_audio=False
         )
-        logger.info(f"Student responses generated - {len(student_responses)} students processed")
+        logger.info("Student responses generated - %d students processed", len(student_responses))
         
         # Generate summary
-        num_raising_hands = sum(1 for r in student_responses if r.would_raise_hand)
+        # bools sum natively as ints; no conditional generator needed
+        num_raising_hands = sum(r.would_raise_hand for r in student_responses)
         summary = (
             f"{num_raising_hands} out of {len(student_responses)} students "
             f"would raise their hand to answer this question."
         )
-        logger.debug(f"Summary: {summary}")
+        logger.debug("Summary: %s", summary)
         
-        students_data = MultiStudentResponse(
+        # Inputs are already-validated models and a literal string, so skip
+        # re-running the validator on construction
+        students_data = MultiStudentResponse.model_construct(
             students=student_responses,
             summary=summary,
         )
         
-        # If not streaming feedback, return JSON immediately
+        # If not streaming feedback, return JSON immediately; the completion
+        # log runs after the response has started flushing
         if not stream_feedback:
-            logger.info("Returning JSON response (no streaming)")
-            return students_data
+            return Response(
+                content=_dump_json_bytes(students_data),
+                media_type="application/json",
+                background=BackgroundTask(
+                    logger.info,
+                    "Returned %d student responses (no streaming)",
+                    len(student_responses),
+                ),
+            )
         
         # Stream feedback via SSE
         logger.info("Starting SSE stream with feedback")
         async def event_stream():
             try:
-                # Send student responses immediately
-                yield f"event: students_response\n"
-                yield f"data: {students_data.model_dump_json()}\n\n"
-                await asyncio.sleep(0.1)
-                logger.debug("Student responses sent via SSE")
-                
-                # Generate and stream feedback
+                # Kick off feedback before writing the students frame so the
+                # Gemini call overlaps serializing/sending the (large) payload
                 logger.debug("Generating teacher feedback")
-                feedback = await feedback_agent.analyze_teacher_move(
-                    latest_teacher_statement=request.prompt,
-                    student_responses=student_responses,
-                    conversation_history=request.conversation_history,
-                    lesson_context=request.lesson_context,
+                feedback_task = asyncio.create_task(
+                    feedback_agent.analyze_teacher_move(
+                        latest_teacher_statement=request.prompt,
+                        student_responses=student_responses,
+                        conversation_history=request.conversation_history,
+                        lesson_context=request.lesson_context,
+                    )
                 )
+
+                # Send student responses immediately
+                yield _sse_event(b"students_response", _dump_json_bytes(students_data))
+                logger.debug("Student responses sent via SSE")
+
+                # Stream feedback once ready
+                feedback = await feedback_task
                 logger.debug("Teacher feedback generated")
                 
                 # Send teacher feedback
-                yield f"event: teacher_feedback\n"
-                yield f"data: {feedback.model_dump_json()}\n\n"
-                await asyncio.sleep(0.05)
-                logger.debug("Teacher feedback sent via SSE")
-                
-                yield f"event: done\n"
-                yield f"data: {{}}\n\n"
+                # Feedback and done always go out together; one yield means
+                # one write/TCP segment for the stream tail
+                yield _sse_event(b"teacher_feedback", _dump_json_bytes(feedback)) + _SSE_DONE_FRAME
                 logger.info("SSE stream completed successfully")
             except Exception as e:
-                logger.error(f"Error in SSE stream: {str(e)}", exc_info=True)
-                yield f"event: error\n"
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                logger.error("Error in SSE stream: %s", e, exc_info=True)
+                yield _sse_event(b"error", orjson.dumps({"error": str(e)}))
         
         return StreamingResponse(
             event_stream(),
@@ -299,91 +435,116 @@ async def ask_students(request: TeacherPromptRequest, stream_feedback: bool = Fa
             }
         )
     except Exception as e:
-        logger.error(f"Error in /ask endpoint: {str(e)}", exc_info=True)
+        logger.error("Error in /ask endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/ask/with-audio")
-async def ask_students_with_audio(request: TeacherPromptRequest, stream_feedback: bool = False):
+async def ask_students_with_audio(
+    request: TeacherPromptRequest,
+    stream_feedback: bool = False,
+    audio_by_reference: bool = False,
+):
     """
     Send a prompt to all student agents and get their responses WITH AUDIO.
-    
+
     The agents process the prompt in parallel and determine:
     - Whether each student would raise their hand
     - Their confidence level
     - Their thinking process
     - What they would say (if anything)
     - Audio (base64-encoded MP3) of what they would say
-    
+
     Args:
         request: Teacher prompt and conversation history
         stream_feedback: If True, streams teacher feedback via SSE after student responses
-    
+        audio_by_reference: If True, responses carry an audio_url to fetch raw
+            MP3 from GET /audio/{token} instead of inline base64 (saves the
+            ~33% base64 inflation and keeps the JSON payload small)
+
     Returns:
         - If stream_feedback=False: JSON with student responses and audio
         - If stream_feedback=True: SSE stream with students+audio first, then feedback
     """
-    logger.info(f"Processing /ask/with-audio request - Prompt: {request.prompt[:100]}... - Stream feedback: {stream_feedback}")
+    logger.info("Processing /ask/with-audio request - Prompt: %.100s... - Stream feedback: %s", request.prompt, stream_feedback)
     
     try:
         # Process prompt with all agents in parallel (with audio)
         logger.debug("Starting parallel student processing (with audio)")
         student_responses = await orchestrator.process_prompt_parallel(
-            request, include_audio=True
+            request, include_audio=True, audio_as_url=audio_by_reference
         )
         
         # Generate summary
-        num_raising_hands = sum(1 for r in student_responses if r.would_raise_hand)
-        num_with_audio = sum(1 for r in student_responses if r.audio_base64)
+        # Single pass over the responses for both counts
+        num_raising_hands = 0
+        num_with_audio = 0
+        for r in student_responses:
+            num_raising_hands += r.would_raise_hand
+            num_with_audio += r.audio_base64 is not None or r.audio_url is not None
         summary = (
             f"{num_raising_hands} out of {len(student_responses)} students "
             f"would raise their hand. Audio generated for {num_with_audio} responses."
         )
-        logger.info(f"Audio responses generated - {num_with_audio}/{len(student_responses)} with audio")
+        logger.info("Audio responses generated - %d/%d with audio", num_with_audio, len(student_responses))
         
-        students_data = MultiStudentResponse(
+        # Inputs are already-validated models and a literal string, so skip
+        # re-running the validator on construction
+        students_data = MultiStudentResponse.model_construct(
             students=student_responses,
             summary=summary,
         )
         
-        # If not streaming feedback, return JSON immediately
+        # If not streaming feedback, return JSON immediately; serialization
+        # happens off-loop (audio payloads are large) and the completion log
+        # runs after the response has started flushing
         if not stream_feedback:
-            logger.info("Returning JSON response with audio (no streaming)")
-            return students_data
+            body = await asyncio.to_thread(_dump_json_bytes, students_data)
+            return Response(
+                content=body,
+                media_type="application/json",
+                background=BackgroundTask(
+                    logger.info,
+                    "Returned %d student responses with audio (no streaming)",
+                    len(student_responses),
+                ),
+            )
         
         # Stream feedback via SSE
         logger.info("Starting SSE stream with audio and feedback")
         async def event_stream():
             try:
-                # Send student responses immediately
-                yield f"event: students_response\n"
-                yield f"data: {students_data.model_dump_json()}\n\n"
-                await asyncio.sleep(0.1)
-                logger.debug("Student responses with audio sent via SSE")
-                
-                # Generate and stream feedback
+                # Kick off feedback before writing the students frame so the
+                # Gemini call overlaps serializing/sending the (large) payload
                 logger.debug("Generating teacher feedback")
-                feedback = await feedback_agent.analyze_teacher_move(
-                    latest_teacher_statement=request.prompt,
-                    student_responses=student_responses,
-                    conversation_history=request.conversation_history,
-                    lesson_context=request.lesson_context,
+                feedback_task = asyncio.create_task(
+                    feedback_agent.analyze_teacher_move(
+                        latest_teacher_statement=request.prompt,
+                        student_responses=student_responses,
+                        conversation_history=request.conversation_history,
+                        lesson_context=request.lesson_context,
+                    )
+                )
+
+                # Serializing megabytes of base64 audio would hold the event
+                # loop for tens of ms; do it on a worker thread
+                students_payload = await asyncio.to_thread(
+                    _dump_json_bytes, students_data
                 )
+                yield _sse_event(b"students_response", students_payload)
+                logger.debug("Student responses with audio sent via SSE")
+
+                # Stream feedback once ready
+                feedback = await feedback_task
                 logger.debug("Teacher feedback generated")
                 
-                # Send teacher feedback
-                yield f"event: teacher_feedback\n"
-                yield f"data: {feedback.model_dump_json()}\n\n"
-                await asyncio.sleep(0.05)
-                logger.debug("Teacher feedback sent via SSE")
-                
-                yield f"event: done\n"
-                yield f"data: {{}}\n\n"
+                # Feedback and done always go out together; one yield means
+                # one write/TCP segment for the stream tail
+                yield _sse_event(b"teacher_feedback", _dump_json_bytes(feedback)) + _SSE_DONE_FRAME
                 logger.info("SSE stream with audio completed successfully")
             except Exception as e:
-                logger.error(f"Error in SSE stream (with audio): {str(e)}", exc_info=True)
-                yield f"event: error\n"
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                logger.error("Error in SSE stream (with audio): %s", e, exc_info=True)
+                yield _sse_event(b"error", orjson.dumps({"error": str(e)}))
         
         return StreamingResponse(
             event_stream(),
@@ -395,7 +556,7 @@ async def ask_students_with_audio(request: TeacherPromptRequest, stream_feedback
             }
         )
     except Exception as e:
-        logger.error(f"Error in /ask/with-audio endpoint: {str(e)}", exc_info=True)
+        logger.error("Error in /ask/with-audio endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -411,74 +572,77 @@ async def ask_students_with_feedback(request: TeacherPromptRequest):
     then gets coaching feedback as it's generated.
     
     SSE Format:
+    - event: student_response            (one per student, fastest first)
+      data: {student_id: ..., response: ...}
+
     - event: students_response
       data: {students: [...], summary: "..."}
-    
+
     - event: feedback_chunk
       data: {insight: {...}, progress: "analyzing..."}
-    
+
     - event: feedback_complete
       data: {overall_observation: "..."}
-    
+
     - event: done
       data: {}
     """
-    logger.info(f"Processing /ask/with-feedback request - Prompt: {request.prompt[:100]}...")
+    logger.info("Processing /ask/with-feedback request - Prompt: %.100s...", request.prompt)
     
     async def event_stream():
         try:
-            # Step 1: Generate student responses immediately (non-blocking)
+            # Step 1: Stream each student's response as it completes, so the
+            # fastest student reaches the client without waiting for the
+            # slowest, then send the aggregate frame as before
             logger.debug("Generating student responses")
-            student_responses = await orchestrator.process_prompt_parallel(
+            student_responses = []
+            async for student_response in orchestrator.process_prompt_stream(
                 request, include_audio=request.include_audio if hasattr(request, 'include_audio') else False
-            )
-            logger.info(f"Student responses generated - {len(student_responses)} students")
+            ):
+                student_responses.append(student_response)
+                yield _sse_event(b"student_response", _dump_json_bytes(student_response))
+            logger.info("Student responses generated - %d students", len(student_responses))
             
             # Send student responses immediately
-            num_raising_hands = sum(1 for r in student_responses if r.would_raise_hand)
+            num_raising_hands = sum(r.would_raise_hand for r in student_responses)
             summary = (
                 f"{num_raising_hands} out of {len(student_responses)} students "
                 f"would raise their hand to answer."
             )
             
-            students_data = MultiStudentResponse(
+            # Inputs are already validated; skip re-running the validator
+            students_data = MultiStudentResponse.model_construct(
                 students=student_responses,
                 summary=summary,
             )
             
-            yield f"event: students_response\n"
-            yield f"data: {students_data.model_dump_json()}\n\n"
-            logger.debug("Student responses sent to client")
-            
-            # Small delay to ensure frontend receives student data first
-            await asyncio.sleep(0.1)
-            
-            # Step 2: Generate feedback in background (streaming)
+            # Step 2: kick off feedback before writing the students frame so
+            # the Gemini call overlaps serializing/sending the payload
             logger.debug("Generating teacher feedback")
-            feedback = await feedback_agent.analyze_teacher_move(
-                latest_teacher_statement=request.prompt,
-                student_responses=student_responses,
-                conversation_history=request.conversation_history,
-                lesson_context=request.lesson_context,
+            feedback_task = asyncio.create_task(
+                feedback_agent.analyze_teacher_move(
+                    latest_teacher_statement=request.prompt,
+                    student_responses=student_responses,
+                    conversation_history=request.conversation_history,
+                    lesson_context=request.lesson_context,
+                )
             )
+
+            yield _sse_event(b"students_response", _dump_json_bytes(students_data))
+            logger.debug("Student responses sent to client")
+
+            feedback = await feedback_task
             logger.debug("Teacher feedback generated")
             
-            # Send teacher feedback
-            yield f"event: teacher_feedback\n"
-            yield f"data: {feedback.model_dump_json()}\n\n"
-            await asyncio.sleep(0.05)
-            logger.debug("Teacher feedback sent to client")
-            
-            # Signal completion
-            yield f"event: done\n"
-            yield f"data: {{}}\n\n"
+            # Feedback and done always go out together; one yield means one
+            # write/TCP segment for the stream tail
+            yield _sse_event(b"teacher_feedback", _dump_json_bytes(feedback)) + _SSE_DONE_FRAME
             logger.info("SSE stream with feedback completed successfully")
-            
+
         except Exception as e:
-            logger.error(f"Error in /ask/with-feedback stream: {str(e)}", exc_info=True)
+            logger.error("Error in /ask/with-feedback stream: %s", e, exc_info=True)
             # Send error event
-            yield f"event: error\n"
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield _sse_event(b"error", orjson.dumps({"error": str(e)}))
     
     return StreamingResponse(
         event_stream(),
@@ -491,6 +655,21 @@ async def ask_students_with_feedback(request: TeacherPromptRequest):
     )
 
 
+@app.get("/audio/{token}")
+async def fetch_audio(token: str):
+    """
+    Serve a synthesized student response as raw MP3.
+
+    Tokens come from /ask/with-audio responses requested with
+    audio_by_reference=true; they reference an in-process bounded store,
+    so long-abandoned audio may have been evicted (404).
+    """
+    audio_bytes = get_stored_audio(token)
+    if audio_bytes is None:
+        raise HTTPException(status_code=404, detail="Audio not found or expired")
+    return Response(content=audio_bytes, media_type="audio/mpeg")
+
+
 @app.post("/lesson/setup", response_model=LessonContext)
 async def setup_lesson(request: LessonSetupRequest):
     """
@@ -526,13 +705,19 @@ async def setup_lesson(request: LessonSetupRequest):
     logger.info("Processing /lesson/setup request")
     
     try:
-        logger.debug(f"Analyzing lesson plan (length: {len(request.lesson_plan_text)} chars)")
+        logger.debug("Analyzing lesson plan (length: %d chars)", len(request.lesson_plan_text))
         student_profiles = profiles
         lesson_context = await lesson_analyzer.analyze_lesson_plan(request, student_profiles)
-        logger.info(f"Lesson analysis complete - Topic: {lesson_context.topic}, Grade: {lesson_context.grade_level}")
-        return lesson_context
+        logger.info("Lesson analysis complete - Topic: %s, Grade: %s", lesson_context.topic, lesson_context.grade_level)
+        # Already a validated LessonContext; returning a Response skips
+        # FastAPI's redundant response_model validation pass (the decorator
+        # annotation still documents the schema)
+        return Response(
+            content=_dump_json_bytes(lesson_context),
+            media_type="application/json",
+        )
     except Exception as e:
-        logger.error(f"Error in /lesson/setup endpoint: {str(e)}", exc_info=True)
+        logger.error("Error in /lesson/setup endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -591,7 +776,7 @@ async def end_lesson(request: EndLessonRequest):
           "celebration": "..."
         }
     """
-    logger.info(f"Processing /lesson/end request - Transcript length: {len(request.conversation_transcript)} exchanges")
+    logger.info("Processing /lesson/end request - Transcript length: %d exchanges", len(request.conversation_transcript))
     
     try:
         logger.debug("Generating comprehensive lesson summary")
@@ -600,34 +785,17 @@ async def end_lesson(request: EndLessonRequest):
             conversation_transcript=request.conversation_transcript
         )
         logger.info("Lesson summary generated successfully")
-        return summary
+        # Already a validated EndLessonResponse; skip the redundant
+        # response_model validation pass
+        return Response(
+            content=_dump_json_bytes(summary),
+            media_type="application/json",
+        )
     except Exception as e:
-        logger.error(f"Error in /lesson/end endpoint: {str(e)}", exc_info=True)
+        logger.error("Error in /lesson/end endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# ============================================================================
-# STARTUP/SHUTDOWN EVENTS
-# ============================================================================
-
-@app.on_event("startup")
-async def startup_event():
-    """Log application startup."""
-    logger.info("=" * 80)
-    logger.info("Rehearsed Multi-Student API - Starting Up")
-    logger.info("=" * 80)
-    logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
-    logger.info(f"Log Level: {os.getenv('LOG_LEVEL', 'INFO')}")
-    logger.info(f"Students Loaded: {len(profiles)}")
-    logger.info("=" * 80)
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Log application shutdown."""
-    logger.info("Rehearsed Multi-Student API - Shutting Down")
-
-
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -638,5 +806,6 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
         log_level=os.getenv("LOG_LEVEL", "info").lower()
     )
\ No newline at end of file
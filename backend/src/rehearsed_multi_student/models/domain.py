@@ -12,10 +12,14 @@ from pydantic import BaseModel, Field
 
 class ConversationMessage(BaseModel):
     """A single message in the conversation history."""
-    
+
     speaker: str = Field(description="The speaker (e.g., 'teacher', student name)")
     message: str = Field(description="The message content")
 
+    def as_line(self) -> str:
+        """Render this message as a 'speaker: message' transcript line."""
+        return f"{self.speaker}: {self.message}"
+
 
 class VoiceSettings(BaseModel):
     """Voice configuration for text-to-speech."""
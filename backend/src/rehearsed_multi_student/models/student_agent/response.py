@@ -24,6 +24,10 @@ class StudentResponse(BaseModel):
         default=None,
         description="Base64-encoded audio (MP3) of the student's response"
     )
+    audio_url: Optional[str] = Field(
+        default=None,
+        description="URL serving the response audio when audio is requested by reference"
+    )
 
 
 class MultiStudentResponse(BaseModel):
@@ -3,7 +3,10 @@
 Prompts for real-time coaching feedback on teacher mathematical discourse.
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1)
 def get_feedback_system_prompt() -> str:
     """Get the feedback coach system prompt.
 
@@ -3,7 +3,10 @@
 Prompts for generating comprehensive end-of-lesson feedback on mathematical discourse.
 """
 
+import functools
 
+
+@functools.lru_cache(maxsize=1)
 def get_lesson_summary_system_prompt() -> str:
     """Get the lesson summary coach system prompt.
 
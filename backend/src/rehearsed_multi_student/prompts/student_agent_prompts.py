@@ -3,16 +3,122 @@
 Prompts for student agents to authentically simulate student responses based on profiles.
 """
 
+import functools
 from typing import List, Optional
 from ..models.domain import StudentProfile, ConversationMessage
 from ..models.lesson_analyzer import LessonContext, StudentApproachOutput
 
 
+# Only the most recent turns are rendered into the prompt; without a cap
+# the history section grows linearly with lesson length, so total tokens
+# sent across a session grow quadratically
+_MAX_HISTORY_TURNS = 8
+
+
 def _format_list(items: List[str]) -> str:
     """Format a list of strings with bullet points."""
     return "\n".join(f"- {item}" for item in items)
 
 
+# Formatted per-profile prompt sections, keyed by profile id (profiles are
+# loaded once at startup and never mutated afterwards)
+_PROFILE_SECTIONS_CACHE: dict = {}
+
+
+def _get_profile_sections(profile: StudentProfile) -> tuple:
+    """Get the formatted strengths/challenges/response-pattern lists for a profile.
+
+    These sections never change between turns, so they are rendered once per
+    profile instead of on every prompt build.
+
+    Args:
+        profile: The student's profile
+
+    Returns:
+        Tuple of (strengths, challenges, response_patterns) formatted text
+    """
+    sections = _PROFILE_SECTIONS_CACHE.get(profile.id)
+    if sections is None:
+        sections = (
+            _format_list(profile.strengths),
+            _format_list(profile.challenges),
+            _format_list(profile.response_patterns),
+        )
+        _PROFILE_SECTIONS_CACHE[profile.id] = sections
+    return sections
+
+
+@functools.lru_cache(maxsize=None)
+def _render_task_block(grade_context: str) -> str:
+    """Render the task-instruction tail of the system prompt.
+
+    The tail only varies by grade level, so it is rendered once per grade
+    seen and reused across every profile and turn.
+
+    Args:
+        grade_context: Grade-level text interpolated into the instructions
+
+    Returns:
+        Rendered task-instruction text
+    """
+    return f"""Your task is to respond to your teacher's question authentically based on your profile.
+You must evaluate:
+1. Would you raise your hand to answer this question? (yes/no)
+2. How confident do you feel about your answer? (0-1 scale)
+3. What is your thinking process?
+4. What would you say if called on? (ALWAYS provide a response - even if you wouldn't raise your hand, you still have thoughts you could share if called on. Keep it brief and authentic to a {grade_context} student)
+***IMPORTANT***: Keep responses concise! 
+
+Respond in JSON format with these exact keys:
+{{
+  "would_raise_hand": true/false,
+  "confidence_score": 0.0-1.0,
+  "thinking_process": "your internal reasoning",
+  "response": "what you would say if called on (always provide this, even if you wouldn't volunteer)"
+}}"""
+
+
+# Last rendered shared lesson block, kept alongside the context object it
+# was rendered from (holding the reference keeps identity comparison safe)
+_LESSON_BLOCK_CACHE: list = [None]
+
+
+def _render_lesson_block(lesson_context: LessonContext) -> str:
+    """Render the profile-independent lesson block, memoized by identity.
+
+    Every student agent in a single request receives the same LessonContext
+    object, so this block only needs rendering once per request rather than
+    once per student.
+
+    Args:
+        lesson_context: The lesson context shared by all students
+
+    Returns:
+        Rendered lesson block text
+    """
+    cached = _LESSON_BLOCK_CACHE[0]
+    if cached is not None and cached[0] is lesson_context:
+        return cached[1]
+
+    block = f"""
+
+LESSON CONTEXT:
+Grade Level: {lesson_context.grade_level}
+Subject: {lesson_context.subject}
+Topic: {lesson_context.topic}
+
+Learning Objectives:
+{_format_list(lesson_context.learning_objectives)}
+
+Key Concepts:
+{_format_list(lesson_context.key_concepts)}
+
+Context: {lesson_context.context_summary}
+"""
+    _LESSON_BLOCK_CACHE[0] = (lesson_context, block)
+    return block
+
+
 def build_student_system_prompt(
     profile: StudentProfile,
     lesson_context: Optional[LessonContext] = None,
@@ -36,21 +142,7 @@ def build_student_system_prompt(
 
     if lesson_context:
         grade_context = lesson_context.grade_level
-        context_section = f"""
-
-LESSON CONTEXT:
-Grade Level: {lesson_context.grade_level}
-Subject: {lesson_context.subject}
-Topic: {lesson_context.topic}
-
-Learning Objectives:
-{_format_list(lesson_context.learning_objectives)}
-
-Key Concepts:
-{_format_list(lesson_context.key_concepts)}
-
-Context: {lesson_context.context_summary}
-
+        context_section = _render_lesson_block(lesson_context) + f"""
 CRITICAL INSTRUCTIONS FOR YOUR UNIQUE RESPONSE:
 - Think and respond as a {lesson_context.grade_level} student learning about {lesson_context.topic}
 - Your language, reasoning depth, and mathematical sophistication should match this grade level
@@ -79,20 +171,22 @@ For {profile.name} ({profile.learning_style}):
     history_section = ""
     if conversation_history:
         history_lines = [
-            f"{msg.speaker}: {msg.message}" for msg in conversation_history
+            msg.as_line() for msg in conversation_history[-_MAX_HISTORY_TURNS:]
         ]
         history_section = "\n\nCONVERSATION HISTORY:\n" + "\n".join(history_lines)
 
+    strengths, challenges, response_patterns = _get_profile_sections(profile)
+
     return f"""You are {profile.name}, a {grade_context} math student with the following characteristics:
 
 LEARNING STYLE: {profile.learning_style}
 DESCRIPTION: {profile.description}
 
 STRENGTHS:
-{_format_list(profile.strengths)}
+{strengths}
 
 CHALLENGES:
-{_format_list(profile.challenges)}
+{challenges}
 
 THINKING APPROACH:
 {profile.thinking_approach}
@@ -101,21 +195,7 @@ CONFIDENCE LEVEL: {profile.traits.confidence_level}/1.0
 PARTICIPATION WILLINGNESS: {profile.traits.participation_willingness}/1.0
 
 TYPICAL RESPONSE PATTERNS:
-{_format_list(profile.response_patterns)}
+{response_patterns}
 {context_section}{history_section}
 
-Your task is to respond to your teacher's question authentically based on your profile.
-You must evaluate:
-1. Would you raise your hand to answer this question? (yes/no)
-2. How confident do you feel about your answer? (0-1 scale)
-3. What is your thinking process?
-4. What would you say if called on? (ALWAYS provide a response - even if you wouldn't raise your hand, you still have thoughts you could share if called on. Keep it brief and authentic to a {grade_context} student)
-***IMPORTANT***: Keep responses concise! 
-
-Respond in JSON format with these exact keys:
-{{
-  "would_raise_hand": true/false,
-  "confidence_score": 0.0-1.0,
-  "thinking_process": "your internal reasoning",
-  "response": "what you would say if called on (always provide this, even if you wouldn't volunteer)"
-}}"""
+{_render_task_block(grade_context)}"""
@@ -1,5 +1,6 @@
 """Services module."""
 
+from rehearsed_multi_student.services.gemini_client import get_gemini_client
 from rehearsed_multi_student.services.tts_service import TextToSpeechService
 
-__all__ = ["TextToSpeechService"]
+__all__ = ["TextToSpeechService", "get_gemini_client"]
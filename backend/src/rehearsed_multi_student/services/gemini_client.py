@@ -0,0 +1,25 @@
+"""Shared Gemini client for all agents and services.
+
+google-genai keeps a pooled HTTP transport inside each Client, so routing
+every agent through one cached client reuses the same connections and auth
+state instead of opening a fresh pool (TLS handshake, auth discovery) per
+agent instance.
+"""
+
+import functools
+import os
+
+from google import genai
+
+
+@functools.lru_cache(maxsize=1)
+def get_gemini_client() -> genai.Client:
+    """Get the process-wide Gemini client (created lazily on first use).
+
+    Returns:
+        The shared genai.Client backed by Vertex AI
+    """
+    project = os.getenv("GOOGLE_CLOUD_PROJECT", "upbeat-lexicon-411217")
+    return genai.Client(
+        vertexai=True, project=project, location="us-central1"
+    )
@@ -9,27 +9,35 @@ All of this is returned in a single LessonContext that is then passed to
 student agents, feedback agents, and lesson summary agents.
 """
 
-import json
 import asyncio
+import hashlib
+from collections import OrderedDict
 from typing import List
-from google import genai
+import orjson
 from google.genai import types
 
 from ..models.lesson_analyzer import LessonSetupRequest, LessonContext
 from ..models.lesson_analyzer.outputs import LessonAnalysisOutput
 from ..models.domain import StudentProfile
 from ..prompts import get_lesson_analysis_system_prompt
+from .gemini_client import get_gemini_client
+
+
+# Most recent analyses kept for re-uploaded lesson plans
+_ANALYSIS_CACHE_MAX_ENTRIES = 32
 
 
 class LessonAnalyzer:
     """Analyzes lesson plans and extracts context with student approaches."""
 
     def __init__(self):
-        """Initialize with Gemini client."""
-        self.client = genai.Client(
-            vertexai=True, project="upbeat-lexicon-411217", location="us-central1"
-        )
+        """Initialize with the shared Gemini client."""
+        self.client = get_gemini_client()
         self.model_id = "gemini-2.5-flash"
+        # LRU of successful analyses keyed by a hash of the lesson plan
+        # content, so re-submitting the same plan (re-practice, reloads)
+        # skips the Gemini call
+        self._analysis_cache: OrderedDict[str, LessonContext] = OrderedDict()
 
     async def analyze_lesson_plan(
         self,
@@ -80,6 +88,15 @@ class LessonAnalyzer:
                 "Must provide either lesson_plan_text or lesson_plan_pdf_base64"
             )
 
+        # Serve an identical plan replay from the cache
+        cache_key = hashlib.sha256(
+            f"{request.lesson_plan_text or ''}|{request.lesson_plan_pdf_base64 or ''}".encode()
+        ).hexdigest()
+        cached_context = self._analysis_cache.get(cache_key)
+        if cached_context is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            return cached_context
+
         # Build system prompt that includes all student profiles
         system_prompt = self._build_analysis_prompt(student_profiles)
 
@@ -96,10 +113,12 @@ class LessonAnalyzer:
             ),
         )
 
-        # Parse the response
+        # Parse the response - the SDK already validates against the response
+        # schema, so only fall back to decoding text if parsing was skipped
         try:
-            result = json.loads(response.text)
-            analysis_output = LessonAnalysisOutput(**result)
+            analysis_output = response.parsed
+            if not isinstance(analysis_output, LessonAnalysisOutput):
+                analysis_output = LessonAnalysisOutput(**orjson.loads(response.text))
 
             # Convert to LessonContext with student approaches indexed by ID
             student_approaches = {
@@ -107,7 +126,7 @@ class LessonAnalyzer:
                 for approach in analysis_output.student_approaches
             }
 
-            return LessonContext(
+            lesson_context = LessonContext(
                 grade_level=analysis_output.grade_level,
                 subject=analysis_output.subject,
                 topic=analysis_output.topic,
@@ -117,7 +136,15 @@ class LessonAnalyzer:
                 mathematical_problem=analysis_output.mathematical_problem,
                 student_approaches=student_approaches,
             )
-        except (json.JSONDecodeError, Exception) as e:
+
+            # Only successful analyses are cached; the fallback below should
+            # be retried on the next submission
+            self._analysis_cache[cache_key] = lesson_context
+            if len(self._analysis_cache) > _ANALYSIS_CACHE_MAX_ENTRIES:
+                self._analysis_cache.popitem(last=False)
+
+            return lesson_context
+        except (orjson.JSONDecodeError, Exception) as e:
             # Fallback response
             print(f"Error parsing lesson analysis: {e}")
             return LessonContext(
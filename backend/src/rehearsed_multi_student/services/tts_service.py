@@ -1,11 +1,51 @@
 """Text-to-speech service using Gemini 2.5 Flash TTS."""
 
+import asyncio
 import base64
+import secrets
+import traceback
+from collections import OrderedDict
 from typing import Optional
 from google.cloud import texttospeech
 
 from rehearsed_multi_student.models.domain import VoiceSettings
 
+# Recently synthesized MP3 blobs kept for by-reference delivery; bounded so
+# abandoned sessions can't grow the store without limit
+_AUDIO_STORE_MAX_ENTRIES = 256
+_audio_store: OrderedDict[str, bytes] = OrderedDict()
+
+
+def store_audio(audio_bytes: bytes) -> str:
+    """Stash an MP3 blob and return the token it can be fetched with.
+
+    Args:
+        audio_bytes: Raw MP3 audio
+
+    Returns:
+        Opaque token for get_stored_audio
+    """
+    token = secrets.token_urlsafe(12)
+    _audio_store[token] = audio_bytes
+    if len(_audio_store) > _AUDIO_STORE_MAX_ENTRIES:
+        _audio_store.popitem(last=False)
+    return token
+
+
+def get_stored_audio(token: str) -> Optional[bytes]:
+    """Fetch a previously stored MP3 blob, or None if evicted/unknown.
+
+    Args:
+        token: Token returned by store_audio
+
+    Returns:
+        Raw MP3 audio, or None
+    """
+    audio_bytes = _audio_store.get(token)
+    if audio_bytes is not None:
+        _audio_store.move_to_end(token)
+    return audio_bytes
+
 
 class TextToSpeechService:
     """Service for converting text to speech using Gemini 2.5 Flash TTS."""
@@ -16,26 +56,28 @@ class TextToSpeechService:
         self.model_name = "gemini-2.5-flash-tts"
     
     async def synthesize_speech(
-        self, 
-        text: str, 
-        voice_settings: VoiceSettings
+        self,
+        text: str,
+        voice_settings: VoiceSettings,
+        as_url: bool = False
     ) -> Optional[str]:
         """
-        Convert text to speech using Gemini 2.5 Flash TTS and return base64-encoded audio.
-        
+        Convert text to speech using Gemini 2.5 Flash TTS.
+
         Args:
             text: The text to convert to speech
             voice_settings: Voice configuration for this student
-            
+            as_url: If True, stash the MP3 bytes in the audio store and
+                return a fetch URL instead of inflating them ~33% as base64
+
         Returns:
-            Base64-encoded MP3 audio data, or None if text is empty
+            Base64-encoded MP3 audio data (or an /audio/{token} URL when
+            as_url is set), or None if text is empty
         """
         if not text or not text.strip():
             return None
         
         try:
-            import asyncio
-            
             # Build synthesis input
             synthesis_input = texttospeech.SynthesisInput(text=text)
             
@@ -61,15 +103,16 @@ class TextToSpeechService:
             
             # The response's audio_content is binary
             audio_bytes = response.audio_content
-            
-            # Encode to base64
-            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-            
+
             print(f"✓ Generated audio for: {text[:30]}... (size: {len(audio_bytes)} bytes)")
-            return audio_base64
+
+            if as_url:
+                return f"/api/audio/{store_audio(audio_bytes)}"
+
+            # Encode to base64
+            return base64.b64encode(audio_bytes).decode('utf-8')
             
         except Exception as e:
             print(f"❌ Error synthesizing speech: {e}")
-            import traceback
             traceback.print_exc()
             return None